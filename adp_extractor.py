@@ -7,12 +7,16 @@ Extracts structured data from ADP paystub PDFs and outputs to JSON or CSV format
 
 import argparse
 import csv
+import functools
+import io
 import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import fnmatch
 
 try:
@@ -58,42 +62,142 @@ FIELD_ORDER = [
     "Pay Period Ending",
 ]
 
+# Write buffer size for output files (1 MiB), so large batches go out in few write calls
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+# FIELD_ORDER patterns followed by their YTD versions, as used by output_csv. A field
+# belongs to the first pattern it matches; literal patterns are looked up by name and
+# only the glob patterns are compiled to regexes (once, here).
+_ORDERED_FIELD_PATTERNS = FIELD_ORDER + [f"{field_pattern} YTD" for field_pattern in FIELD_ORDER]
+_LITERAL_FIELD_INDEX: Dict[str, int] = {}
+_GLOB_FIELD_PATTERNS: List[Tuple[int, re.Pattern]] = []
+for _index, _field_pattern in enumerate(_ORDERED_FIELD_PATTERNS):
+    if any(c in _field_pattern for c in '*?['):
+        _GLOB_FIELD_PATTERNS.append((_index, re.compile(fnmatch.translate(_field_pattern))))
+    else:
+        _LITERAL_FIELD_INDEX.setdefault(_field_pattern, _index)
+del _index, _field_pattern
+
+# Deduction names to look for in the Deductions section
+# NOTE: "State Income Tax" is intentionally excluded because it's a substring of "GA State Income Tax"
+DEDUCTION_NAMES = [
+    'Federal Income Tax',
+    'Social Security Tax',
+    'Medicare Tax',
+    'Medicare Surtax',
+    'GA State Income Tax',
+    'Rsu Net Value',
+    'Basic Life Inc',
+    'Accident',
+    'Ad&D Spouse',
+    'Ad&D',
+    'After-Tax Ded',
+    'Crit Ill Spouse',
+    'Critical Illnes',
+    'Dental Pretax',
+    'Ee Life',
+    'Espp',
+    'Hsa',
+    'Legal',
+    'Medical Pretax',
+    'Non Ca Std',
+    'Roth 401K',
+    'Spouse Life',
+    'Vision Pretax',
+]
 
+# All deduction names as one alternation, longest first, so a line is scanned once and
+# overlapping names (e.g. "Ad&D Spouse" and "Ad&D") resolve to the more specific one
+_RE_DEDUCTION_NAME = re.compile('|'.join(re.escape(name) for name in sorted(DEDUCTION_NAMES, key=len, reverse=True)))
+
+# Benefit deductions that may only show a YTD value (e.g. on RSU paystubs)
+# NOTE: "Espp" is NOT in this set because the "Espp" deduction line has both "this period" and YTD values
+# Only "Espp *" pattern matches in Other Benefits are YTD-only
+_BENEFIT_YTD_ONLY = frozenset({
+    'Basic Life Inc', 'Accident', 'Ad&D', 'Ad&D Spouse', 'After-Tax Ded', 'Crit Ill Spouse', 'Critical Illnes',
+    'Dental Pretax', 'Ee Life', 'Hsa', 'Legal', 'Medical Pretax', 'Non Ca Std', 'Roth 401K', 'Spouse Life',
+    'Vision Pretax',
+})
+
+# Rsu Net Value special case: when it appears with single value on non-RSU paystubs, it's YTD
+_ALWAYS_YTD_SINGLE = frozenset({'Rsu Net Value'})
+
+# Earnings section lines that are not earnings
+_SKIP_EARNING_DESCS = frozenset({'Net Pay', 'Net Check'})
+
+# Any ADP amount within a line: 4, 3, 2 or 1 space-separated tokens
+# (e.g. "1 040 968 50", "1 234 56", "123 45", "50"); the last two digits are cents.
+# Longer forms are tried first, and amounts must start and end on token boundaries.
+_RE_ANY_AMOUNT = re.compile(r'(?<!\S)-?(?:\d{1,4}(?:\s+\d{3}){0,2}\s+\d{2}|\d{2})\*?(?!\S)')
+
+# Two or more whitespace-separated tokens, used to detect a new field name between amounts
+_RE_FIELD_BREAK = re.compile(r'\S\s+\S')
+
+# Characters removed from an amount string (after its whitespace) before formatting it
+_STRIP_TBL = str.maketrans('', '', ',*')
+
+# Pay period header dates, and the output field for each label
+_RE_DATES = re.compile(r'(?P<kind>Period Beginning|Period Ending|Pay Date):\s*(?P<date>\d{1,2}/\d{1,2}/\d{4})')
+_DATE_FIELDS = {
+    "Period Beginning": "Pay Period Beginning",
+    "Period Ending": "Pay Period Ending",
+    "Pay Date": "Pay Date",
+}
+
+# Headings that end the earnings section
+_RE_EARNINGS_END = re.compile(r'Gross Pay|Federal Income Tax|Deductions|Net Check')
+
+# Leading description (letters and spaces) of an earnings line
+_RE_DESCRIPTION = re.compile(r'^([A-Za-z\s]+)')
+
+# Text following "Espp" that marks an Other Benefit rather than a deduction:
+# a date range (e.g. "Espp 3/15-9/14") or a positive amount (e.g. "Espp 1 234 56")
+_RE_ESPP_DATE_SUFFIX = re.compile(r'\s+\d+/')
+_RE_ESPP_AMOUNT_SUFFIX = re.compile(r'\s+\d+\s+\d+')
+
+# Benefit names in the Other Benefits and Information section, each followed by its amount
+# "Espp *" matches "Espp 3/15-9/14", "Espp 9/15-3/14", etc.
+# Note: We don't capture standalone "Espp <amount>" as it's just a summary line,
+# and "Espp <negative amount>" is a deduction, not a benefit
+_RE_BENEFIT = re.compile(
+    r'(?P<name>Current Match\b|(?<!\S)Espp\s+(?!-*\d+(?!\S))\S+|Ytd 401K Match\b|Sick Earned Bal\b)'
+    r'\s+(?P<amount>' + _RE_ANY_AMOUNT.pattern + ')'
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def clean_amount(amount_str: str) -> str:
     """
     Clean and format an amount string from the PDF.
     ADP formats amounts like "5 432 10" which should be "5432.10"
-    The last two digits are cents.
+    The last two digits are cents, so "50" becomes "0.50".
+    Returns "" if the string is not a number.
+    Results are cached since the same amounts recur across lines and paystubs.
     """
-    # Remove spaces, commas, asterisks
-    cleaned = amount_str.replace(' ', '').replace(',', '').replace('*', '').strip()
-    cleaned = cleaned.rstrip('\n')
+    # Remove all whitespace (including Unicode spaces such as U+00A0, which the amount
+    # patterns accept as separators), then commas and asterisks
+    cleaned = ''.join(amount_str.split()).translate(_STRIP_TBL)
 
     if not cleaned:
         return ""
 
-    # Check if it starts with a minus sign
-    is_negative = cleaned.startswith('-')
-    if is_negative:
-        cleaned = cleaned[1:]
-
-    # If we have at least 2 digits, insert decimal point before last 2 digits
-    if cleaned and len(cleaned) >= 2 and cleaned.isdigit():
-        # Insert decimal point before last 2 digits
-        cleaned = cleaned[:-2] + '.' + cleaned[-2:]
-
-    # Add back the negative sign if needed
-    if is_negative:
-        cleaned = '-' + cleaned
+    # The remaining digits are the amount in cents (int() handles the minus sign)
+    try:
+        cents = int(cleaned)
+    except ValueError:
+        return ""
 
-    return cleaned
+    # Keep the sign from the text so "-0 00" stays negative
+    sign = '-' if cleaned[0] == '-' else ''
+    dollars, cents = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{cents:02d}"
 
 
 def extract_first_amount_from_line(line: str, description: str) -> Optional[str]:
     """
     Extract the first amount from a line after the description.
     ADP format: "Description Amount1 Amount2" where amounts are space-separated digits.
-    Amounts can be: "50" or "123 45" or "1 234 56" format.
+    Amounts can be: "50" or "123 45" or "1 234 56" or "1 040 968 50" format.
     """
     # Remove description from line
     if description and description in line:
@@ -101,128 +205,47 @@ def extract_first_amount_from_line(line: str, description: str) -> Optional[str]
     else:
         remainder = line.strip()
 
-    # Split by spaces
-    tokens = remainder.split()
-    if not tokens:
-        return None
-
-    # Try 3 tokens first (e.g., "1 234 56" or "-1 234 56")
-    if len(tokens) >= 3:
-        potential = ' '.join(tokens[:3])
-        # Check if it's format: X XXX XX (1-4 digits, 3 digits, 2 digits)
-        if re.match(r'-?\d{1,4}\s\d{3}\s\d{2}\*?$', potential):
-            return clean_amount(potential)
-
-    # Try 2 tokens (e.g., "123 45" or "-123 45")
-    if len(tokens) >= 2:
-        potential = ' '.join(tokens[:2])
-        # Check if it's format: XXX XX (1-4 digits, 2 digits)
-        if re.match(r'-?\d{1,4}\s\d{2}\*?$', potential):
-            return clean_amount(potential)
-
-    # Try 1 token (e.g., "50")
-    if len(tokens) >= 1:
-        potential = tokens[0]
-        if re.match(r'-?\d{2}\*?$', potential):
-            return clean_amount(potential)
+    # The amount must start right after the description
+    amount_match = _RE_ANY_AMOUNT.match(remainder)
+    if amount_match:
+        return clean_amount(amount_match.group(0))
 
     return None
 
 
-def extract_amounts_from_line(line: str, description: str) -> Tuple[Optional[str], Optional[str]]:
+def extract_amounts_from_line(line: str, description: str, start_pos: int = -1) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract both "this period" and YTD amounts from a line after the description.
     Returns a tuple: (this_period_amount, ytd_amount)
 
     For earnings lines: "Description Rate Hours ThisPeriod YTD"
     For deduction lines: "Description ThisPeriod YTD"
+
+    If start_pos is given, it is the position of the description in the line,
+    which avoids searching the line for it again.
     """
     # Remove description from line
-    if description and description in line:
+    if start_pos >= 0:
+        remainder = line[start_pos + len(description):].strip()
+    elif description and description in line:
         remainder = line.split(description, 1)[1].strip()
     else:
         remainder = line.strip()
 
-    # Split by spaces
-    tokens = remainder.split()
-    if not tokens:
-        return (None, None)
-
-    # Helper function to try extracting an amount starting at a given token index
-    def try_extract_at(start_idx: int) -> Optional[str]:
-        if start_idx >= len(tokens):
-            return None
-
-        # Try 4 tokens (e.g., "1 040 968 50" for amounts over 999,999.99)
-        if start_idx + 3 < len(tokens):
-            potential = ' '.join(tokens[start_idx:start_idx+4])
-            if re.match(r'-?\d{1,4}\s\d{3}\s\d{3}\s\d{2}\*?$', potential):
-                return clean_amount(potential)
-
-        # Try 3 tokens (e.g., "1 234 56" or "-1 234 56")
-        if start_idx + 2 < len(tokens):
-            potential = ' '.join(tokens[start_idx:start_idx+3])
-            if re.match(r'-?\d{1,4}\s\d{3}\s\d{2}\*?$', potential):
-                return clean_amount(potential)
-
-        # Try 2 tokens (e.g., "123 45" or "-123 45")
-        if start_idx + 1 < len(tokens):
-            potential = ' '.join(tokens[start_idx:start_idx+2])
-            if re.match(r'-?\d{1,4}\s\d{2}\*?$', potential):
-                return clean_amount(potential)
-
-        # Try 1 token (e.g., "50")
-        if start_idx < len(tokens):
-            potential = tokens[start_idx]
-            if re.match(r'-?\d{2}\*?$', potential):
-                return clean_amount(potential)
-
-        return None
+    # Scan the remainder once for amounts in left-to-right order
+    amount_matches = _RE_ANY_AMOUNT.finditer(remainder)
 
     # Extract the first amount (this period)
-    this_period = None
-    this_period_end_idx = 0
-
-    # Try to find the first amount
-    idx = 0
-    while idx < len(tokens):
-        # Try 4 tokens (e.g., "1 040 968 50")
-        if idx + 3 < len(tokens):
-            potential = ' '.join(tokens[idx:idx+4])
-            if re.match(r'-?\d{1,4}\s\d{3}\s\d{3}\s\d{2}\*?$', potential):
-                this_period = clean_amount(potential)
-                this_period_end_idx = idx + 4
-                break
-
-        # Try 3 tokens
-        if idx + 2 < len(tokens):
-            potential = ' '.join(tokens[idx:idx+3])
-            if re.match(r'-?\d{1,4}\s\d{3}\s\d{2}\*?$', potential):
-                this_period = clean_amount(potential)
-                this_period_end_idx = idx + 3
-                break
-
-        # Try 2 tokens
-        if idx + 1 < len(tokens):
-            potential = ' '.join(tokens[idx:idx+2])
-            if re.match(r'-?\d{1,4}\s\d{2}\*?$', potential):
-                this_period = clean_amount(potential)
-                this_period_end_idx = idx + 2
-                break
-
-        # Try 1 token
-        potential = tokens[idx]
-        if re.match(r'-?\d{2}\*?$', potential):
-            this_period = clean_amount(potential)
-            this_period_end_idx = idx + 1
-            break
-
-        idx += 1
+    first_match = next(amount_matches, None)
+    if first_match is None:
+        return (None, None)
+    this_period = clean_amount(first_match.group(0))
 
-    # Extract the second amount (YTD) starting after the first amount
+    # Extract the second amount (YTD), which must immediately follow the first amount
     ytd = None
-    if this_period is not None:
-        ytd = try_extract_at(this_period_end_idx)
+    second_match = next(amount_matches, None)
+    if second_match is not None and not remainder[first_match.end():second_match.start()].strip():
+        ytd = clean_amount(second_match.group(0))
 
     return (this_period, ytd)
 
@@ -235,34 +258,32 @@ def extract_pay_period_dates(text: str) -> Dict[str, Optional[str]]:
         "Pay Date": None
     }
 
-    # Match patterns like "Period Beginning: 01/01/2024"
-    beginning_match = re.search(r'Period Beginning:\s*(\d{1,2}/\d{1,2}/\d{4})', text)
-    if beginning_match:
-        dates["Pay Period Beginning"] = beginning_match.group(1)
-
-    ending_match = re.search(r'Period Ending:\s*(\d{1,2}/\d{1,2}/\d{4})', text)
-    if ending_match:
-        dates["Pay Period Ending"] = ending_match.group(1)
-
-    pay_date_match = re.search(r'Pay Date:\s*(\d{1,2}/\d{1,2}/\d{4})', text)
-    if pay_date_match:
-        dates["Pay Date"] = pay_date_match.group(1)
+    # Match patterns like "Period Beginning: 01/01/2024" in a single scan of the text,
+    # keeping the first date found for each label
+    remaining = len(dates)
+    for date_match in _RE_DATES.finditer(text):
+        field = _DATE_FIELDS[date_match.group('kind')]
+        if dates[field] is None:
+            dates[field] = date_match.group('date')
+            remaining -= 1
+            if not remaining:
+                break
 
     return dates
 
 
-def extract_taxable_wages(text: str) -> Dict[str, Optional[str]]:
+def extract_taxable_wages(lines: List[str], lower_lines: List[str]) -> Dict[str, Optional[str]]:
     """Extract taxable wages for this period."""
     result = {}
 
     # Look for the line with taxable wages
-    lines = text.split('\n')
     for i, line in enumerate(lines):
-        if 'federal taxable wages this period' in line.lower():
+        lower_line = lower_lines[i]
+        if 'federal taxable wages this period' in lower_line:
             # The amount might be on the same line after "are" or on the next few lines
             # Check same line first
-            if ' are ' in line.lower():
-                parts = line.lower().split(' are ')
+            if ' are ' in lower_line:
+                parts = lower_line.split(' are ')
                 if len(parts) > 1:
                     amount_part = parts[1].strip()
                     # Remove $ if present
@@ -274,8 +295,9 @@ def extract_taxable_wages(text: str) -> Dict[str, Optional[str]]:
                             break
 
             # Also check if there's a $ amount on the same line (might be at the end)
-            if '$' in line:
-                amount_part = line.split('$')[-1].strip()
+            dollar_idx = line.rfind('$')
+            if dollar_idx >= 0:
+                amount_part = line[dollar_idx+1:].strip()
                 amount = extract_first_amount_from_line(amount_part, '')
                 if amount:
                     result["Taxable Wages This Period"] = amount
@@ -283,10 +305,11 @@ def extract_taxable_wages(text: str) -> Dict[str, Optional[str]]:
 
             # Check next few lines for an amount starting with $ (e.g., "$4 500 00")
             for j in range(i+1, min(i+4, len(lines))):
-                next_line = lines[j].strip()
-                if '$' in next_line:
-                    # Extract everything after the $
-                    amount_part = next_line.split('$')[-1].strip()
+                next_line = lines[j]
+                dollar_idx = next_line.rfind('$')
+                if dollar_idx >= 0:
+                    # Extract everything after the last $
+                    amount_part = next_line[dollar_idx+1:].strip()
                     amount = extract_first_amount_from_line(amount_part, '')
                     if amount:
                         result["Taxable Wages This Period"] = amount
@@ -297,89 +320,58 @@ def extract_taxable_wages(text: str) -> Dict[str, Optional[str]]:
     return result
 
 
-def parse_earnings_section(text: str) -> Dict[str, str]:
+def _is_earnings_header(lower_line: str) -> bool:
+    """Check if a lowercase line is the earnings table header ("rate hours this period year to date")."""
+    return 'rate' in lower_line and 'hours' in lower_line and 'this period' in lower_line
+
+
+def parse_earnings_section(lines: List[str], lower_lines: List[str]) -> Dict[str, str]:
     """Parse the Earnings section."""
     earnings = {}
 
     # Look for earnings section - typically has "rate hours this period year to date"
     # Then lines like "Regular 5000 00 80 00 5 000 00 5 000 00"
     # Format: Description Rate Hours ThisPeriod YTD
-    lines = text.split('\n')
-
-    in_earnings = False
-    for i, line in enumerate(lines):
-        # Start of earnings section
-        if 'rate' in line.lower() and 'hours' in line.lower() and 'this period' in line.lower():
-            in_earnings = True
+    # Locate the start of the earnings section first, so only its lines are parsed
+    start = next((i for i, lower_line in enumerate(lower_lines) if _is_earnings_header(lower_line)), None)
+    if start is None:
+        return earnings
+
+    for i in range(start + 1, len(lines)):
+        line = lines[i]
+        # Skip repeated header lines
+        if _is_earnings_header(lower_lines[i]):
             continue
 
         # End of earnings section (when we hit other sections)
-        if in_earnings and any(keyword in line for keyword in ['Gross Pay', 'Federal Income Tax', 'Deductions', 'Net Check']):
+        if _RE_EARNINGS_END.search(line):
             break
 
-        if in_earnings and line.strip():
+        if line.strip():
             # Try to parse earnings lines
             # Pattern: Description followed by numbers
             # Extract description (letters and spaces at the start)
-            desc_match = re.match(r'^([A-Za-z\s]+)', line)
+            desc_match = _RE_DESCRIPTION.match(line)
             if desc_match:
                 description = desc_match.group(1).strip()
                 # Skip non-earning lines like "Net Pay" and "Net Check"
-                if description in ['Net Pay', 'Net Check']:
+                if description in _SKIP_EARNING_DESCS:
                     continue
                 # For earnings, need to skip rate and hours and get the 3rd and 4th amounts
                 # However, some earnings (like RSU) don't have rate/hours, just this period and YTD
                 remainder = line.split(description, 1)[1].strip() if description in line else line.strip()
-                tokens = remainder.split()
 
                 # Extract all amounts in order
                 amounts = []
-                idx = 0
-                consecutive_non_numbers = 0
-                while idx < len(tokens):
-                    # Try 4 tokens (e.g., "1 040 968 50")
-                    if idx + 3 < len(tokens):
-                        potential = ' '.join(tokens[idx:idx+4])
-                        if re.match(r'-?\d{1,4}\s\d{3}\s\d{3}\s\d{2}\*?$', potential):
-                            amounts.append(clean_amount(potential))
-                            idx += 4
-                            consecutive_non_numbers = 0
-                            continue
-
-                    # Try 3 tokens
-                    if idx + 2 < len(tokens):
-                        potential = ' '.join(tokens[idx:idx+3])
-                        if re.match(r'-?\d{1,4}\s\d{3}\s\d{2}\*?$', potential):
-                            amounts.append(clean_amount(potential))
-                            idx += 3
-                            consecutive_non_numbers = 0
-                            continue
-
-                    # Try 2 tokens
-                    if idx + 1 < len(tokens):
-                        potential = ' '.join(tokens[idx:idx+2])
-                        if re.match(r'-?\d{1,4}\s\d{2}\*?$', potential):
-                            amounts.append(clean_amount(potential))
-                            idx += 2
-                            consecutive_non_numbers = 0
-                            continue
-
-                    # Try 1 token
-                    potential = tokens[idx]
-                    if re.match(r'-?\d{2}\*?$', potential):
-                        amounts.append(clean_amount(potential))
-                        idx += 1
-                        consecutive_non_numbers = 0
-                        continue
-
-                    # Not a number - check if it looks like a new field name
+                previous_end = 0
+                for amount_match in _RE_ANY_AMOUNT.finditer(remainder):
+                    # Tokens between amounts are not numbers - check if they look like a new field name
                     # If we see 2+ consecutive words (likely a new field), stop extraction
-                    consecutive_non_numbers += 1
-                    if consecutive_non_numbers >= 2:
+                    if _RE_FIELD_BREAK.search(remainder, previous_end, amount_match.start()):
                         # Likely encountered a new field name, stop extracting
                         break
-
-                    idx += 1
+                    amounts.append(clean_amount(amount_match.group(0)))
+                    previous_end = amount_match.end()
 
                 # Determine if this is a regular earnings line (with rate/hours) or RSU-style (without)
                 # Regular lines have at least 4 amounts: Rate, Hours, This Period, YTD
@@ -406,95 +398,65 @@ def parse_earnings_section(text: str) -> Dict[str, str]:
     return earnings
 
 
-def parse_deductions_section(text: str) -> Dict[str, str]:
+def parse_deductions_section(lines: List[str], lower_lines: List[str]) -> Dict[str, str]:
     """Parse the Deductions section (taxes and other deductions)."""
     deductions = {}
 
-    lines = text.split('\n')
-
-    # Common deduction names to look for
-    # NOTE: Order matters! More specific names must come before general ones
-    # (e.g., "Ad&D Spouse" before "Ad&D", "Crit Ill Spouse" before any other Crit Ill)
-    # NOTE: "State Income Tax" is intentionally excluded because it's a substring of "GA State Income Tax"
-    deduction_names = [
-        'Federal Income Tax',
-        'Social Security Tax',
-        'Medicare Tax',
-        'Medicare Surtax',
-        'GA State Income Tax',
-        'Rsu Net Value',
-        'Basic Life Inc',
-        'Accident',
-        'Ad&D Spouse',  # Must come before 'Ad&D'
-        'Ad&D',
-        'After-Tax Ded',
-        'Crit Ill Spouse',  # Must come before 'Critical Illnes'
-        'Critical Illnes',
-        'Dental Pretax',
-        'Ee Life',
-        'Espp',
-        'Hsa',
-        'Legal',
-        'Medical Pretax',
-        'Non Ca Std',
-        'Roth 401K',
-        'Spouse Life',
-        'Vision Pretax',
-    ]
-
     # Track if we're past the main tax deductions (which typically have "this period" values)
     # After main taxes, benefit-related deductions often only show YTD values
     in_other_benefits_or_ytd_only_section = False
-    # NOTE: "Espp" is NOT in this list because the "Espp" deduction line has both "this period" and YTD values
-    # Only "Espp *" pattern matches in Other Benefits are YTD-only
-    benefit_deductions_that_may_be_ytd_only = ['Basic Life Inc', 'Accident', 'Ad&D', 'Ad&D Spouse', 'After-Tax Ded', 'Crit Ill Spouse', 'Critical Illnes', 'Dental Pretax', 'Ee Life', 'Hsa', 'Legal', 'Medical Pretax', 'Non Ca Std', 'Roth 401K', 'Spouse Life', 'Vision Pretax']
-    # Rsu Net Value special case: when it appears with single value on non-RSU paystubs, it's YTD
-    always_ytd_when_single = ['Rsu Net Value']
+
+    # Deductions that have not been stored yet; once all are found the remaining lines can't change anything
+    remaining = set(DEDUCTION_NAMES)
 
     for i, line in enumerate(lines):
+        if not remaining:
+            break
+
         # After we see "Other Benefits and", treat single values as YTD
-        if 'Other Benefits and' in line or 'this period total to date' in line.lower():
+        if 'Other Benefits and' in line or 'this period total to date' in lower_lines[i]:
             in_other_benefits_or_ytd_only_section = True
 
         # Find ALL matching deduction names on this line (some lines have multiple deductions)
-        # Sort by position to process them in order
+        # in a single left-to-right scan; overlapping names resolve to the longest one
         matches = []
-        for deduction_name in deduction_names:
-            if deduction_name in line:
-                pos = line.find(deduction_name)
-                # Special check for "Espp": don't match if it's part of "Espp Refund" or "Espp <date>" or "Espp <positive_amount>"
-                if deduction_name == 'Espp':
-                    # Check if "Espp Refund" is at this specific position
-                    if line[pos:pos+11] == 'Espp Refund':
-                        # Skip this match
-                        continue
-                    # Check if this specific "Espp" is followed by a date pattern (e.g., "Espp 3/15-9/14")
-                    # or a positive amount (e.g., "Espp 1 234 56")
-                    # which is an Other Benefit, not a Deduction
-                    # Deductions always have a negative sign (e.g., "Espp -100 00 100 00")
-                    # Look at the text right after this "Espp" match
-                    text_after = line[pos+4:pos+20]  # Get text after "Espp"
-                    if re.match(r'\s+\d+/', text_after):
-                        # Skip this match - it's an Other Benefit with date
-                        continue
-                    # Check if followed by a positive amount (digits without negative sign)
-                    # This is an Other Benefit YTD value
-                    if re.match(r'\s+\d+\s+\d+', text_after):
-                        # Skip this match - it's an Other Benefit YTD
-                        continue
-                matches.append((pos, deduction_name))
-        
-        # Sort by position (process left to right)
-        matches.sort()
-
-        # Process each matched deduction on this line
-        for best_match_position, matched_deduction in matches:
+        for name_match in _RE_DEDUCTION_NAME.finditer(line):
+            pos = name_match.start()
+            deduction_name = name_match.group(0)
             # Skip if we've already processed this deduction
-            if f"Deductions {matched_deduction}" in deductions or f"Deductions {matched_deduction} YTD" in deductions:
+            if deduction_name not in remaining:
+                continue
+            # Special check for "Espp": don't match if it's part of "Espp Refund" or "Espp <date>" or "Espp <positive_amount>"
+            if deduction_name == 'Espp':
+                # Check if "Espp Refund" is at this specific position
+                if line[pos:pos+11] == 'Espp Refund':
+                    # Skip this match
+                    continue
+                # Check if this specific "Espp" is followed by a date pattern (e.g., "Espp 3/15-9/14")
+                # or a positive amount (e.g., "Espp 1 234 56")
+                # which is an Other Benefit, not a Deduction
+                # Deductions always have a negative sign (e.g., "Espp -100 00 100 00")
+                # Look at the text right after this "Espp" match
+                text_after = line[pos+4:pos+20]  # Get text after "Espp"
+                if _RE_ESPP_DATE_SUFFIX.match(text_after):
+                    # Skip this match - it's an Other Benefit with date
+                    continue
+                # Check if followed by a positive amount (digits without negative sign)
+                # This is an Other Benefit YTD value
+                if _RE_ESPP_AMOUNT_SUFFIX.match(text_after):
+                    # Skip this match - it's an Other Benefit YTD
+                    continue
+            matches.append((pos, deduction_name))
+
+        # Process each matched deduction on this line (already ordered left to right)
+        for best_match_position, matched_deduction in matches:
+            # Skip if we've already processed this deduction (e.g. it appears twice on this line)
+            if matched_deduction not in remaining:
                 continue
             
             deduction_name = matched_deduction
-            this_period, ytd = extract_amounts_from_line(line, deduction_name)
+            # Extract from the matched position so amounts belong to this occurrence of the name
+            this_period, ytd = extract_amounts_from_line(line, deduction_name, best_match_position)
 
             # Special handling for Social Security Tax when only one value
             # This happens when employee maxes out Social Security contributions
@@ -507,12 +469,12 @@ def parse_deductions_section(text: str) -> Dict[str, str]:
                     this_period = None
 
             # Special handling for "Rsu Net Value" - when single value, it's always YTD
-            if this_period and not ytd and deduction_name in always_ytd_when_single:
+            if this_period and not ytd and deduction_name in _ALWAYS_YTD_SINGLE:
                 ytd = this_period
                 this_period = None
             # For benefit deductions that only have one value, treat as YTD
             # This happens in RSU paystubs where benefits show cumulative values only
-            elif this_period and not ytd and deduction_name in benefit_deductions_that_may_be_ytd_only:
+            elif this_period and not ytd and deduction_name in _BENEFIT_YTD_ONLY:
                 # Check if we're in a section where single values should be YTD
                 # OR if we've already seen an indicator we're in the YTD-only benefit section
                 if in_other_benefits_or_ytd_only_section:
@@ -529,82 +491,32 @@ def parse_deductions_section(text: str) -> Dict[str, str]:
                 deductions[f"Deductions {deduction_name}"] = this_period
             if ytd:
                 deductions[f"Deductions {deduction_name} YTD"] = ytd
+            if this_period or ytd:
+                remaining.discard(deduction_name)
 
             # After processing a benefit deduction with only YTD, mark that we're in YTD-only section
-            if deduction_name in benefit_deductions_that_may_be_ytd_only and ytd and not deductions.get(f"Deductions {deduction_name}"):
+            if deduction_name in _BENEFIT_YTD_ONLY and ytd and not deductions.get(f"Deductions {deduction_name}"):
                 in_other_benefits_or_ytd_only_section = True
 
     return deductions
 
 
-def parse_other_benefits_section(text: str) -> Dict[str, str]:
+def parse_other_benefits_section(lines: List[str]) -> Dict[str, str]:
     """Parse the Other Benefits and Information section."""
     benefits = {}
 
-    lines = text.split('\n')
-
-    # Common benefit names to look for (supports glob patterns)
-    benefit_names = [
-        'Current Match',
-        'Espp *',  # Matches "Espp 3/15-9/14", "Espp 9/15-3/14", etc.
-        # Note: We don't capture standalone "Espp <amount>" as it's just a summary line
-        'Ytd 401K Match',
-        'Sick Earned Bal',
-    ]
-
+    # Find every benefit name and the amount right after it in a single scan per line
+    # (lines in the two-column layout can hold more than one benefit)
     for line in lines:
-        for benefit_pattern in benefit_names:
-            # Check for exact match or glob pattern match
-            matched_name = None
-            if '*' in benefit_pattern or '?' in benefit_pattern or '[' in benefit_pattern:
-                # Use glob pattern matching
-                # Extract the benefit name from the line
-                words = line.split()
-                for i in range(len(words)):
-                    # Try matching progressively longer sequences
-                    for j in range(i+1, min(i+5, len(words)+1)):
-                        candidate = ' '.join(words[i:j])
-                        if fnmatch.fnmatch(candidate, benefit_pattern):
-                            # Additional validation: make sure the candidate doesn't include a negative number
-                            # (which would indicate it's a deduction, not a benefit)
-                            # Check if any word in the candidate starts with '-' and is followed by digits
-                            has_negative = any(word.startswith('-') and word.lstrip('-').replace(' ', '').isdigit() for word in words[i:j])
-                            if has_negative:
-                                # This is likely a deduction line, skip it
-                                continue
-
-                            # For patterns like "Espp *", ensure the wildcard part is not just a number
-                            # (which would mean we're matching the amount, not the field name)
-                            if benefit_pattern == 'Espp *':
-                                # Get the part after "Espp "
-                                if candidate.startswith('Espp '):
-                                    suffix = candidate[5:]  # Everything after "Espp "
-                                    # Check if the suffix looks like it could be a field name (contains /, -, or letters)
-                                    if not any(c in suffix for c in ['/', '-']) and suffix.replace(' ', '').isdigit():
-                                        # This is just a number, not a field name
-                                        continue
-
-                            matched_name = candidate
-                            break
-                    if matched_name:
-                        break
-            else:
-                # Exact match
-                if benefit_pattern in line:
-                    matched_name = benefit_pattern
-
-            if matched_name:
-                # Benefits typically only show YTD values (single amount)
-                amount = extract_first_amount_from_line(line, matched_name)
-                if amount:
-                    # Store as YTD since benefits are cumulative
-                    benefits[f"Other Benefits {matched_name}"] = amount
-                break  # Move to next line once we found a match
+        for benefit_match in _RE_BENEFIT.finditer(line):
+            # Benefits typically only show YTD values (single amount)
+            # Store as YTD since benefits are cumulative
+            benefits[f"Other Benefits {benefit_match.group('name')}"] = clean_amount(benefit_match.group('amount'))
 
     return benefits
 
 
-def parse_other_section(text: str) -> Dict[str, str]:
+def parse_other_section(lines: List[str]) -> Dict[str, str]:
     """Parse the Other section (if any)."""
     # This section may vary by paystub
     # For now, return empty dict as the example doesn't have a clear "Other" table
@@ -622,15 +534,37 @@ def extract_paystub_data(pdf_path: str) -> Optional[Dict[str, str]]:
         Dictionary containing all extracted data, or None if extraction failed
     """
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # Combine text from all pages
-            full_text = ""
+        # Read the file in one go so pdfminer parses from memory instead of issuing many small
+        # seeks and reads on the file. laparams is left unset: only extract_text() is needed,
+        # so pdfminer's layout analysis is skipped entirely.
+        with open(pdf_path, 'rb') as pdf_file:
+            pdf_bytes = pdf_file.read()
+
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            # Collect the lines of all pages one page at a time
+            # (section parsers still see every line, since sections can span pages)
+            lines = []
+            lower_lines = []
+            dates = {}
             for page in pdf.pages:
                 page_text = page.extract_text()
-                if page_text:
-                    full_text += page_text + "\n"
+                # Release the page's cached layout objects once its text has been extracted
+                page.close()
+                if not page_text:
+                    continue
+
+                # Pay period dates are in the header, so stop searching once all of them are found
+                if not dates or None in dates.values():
+                    for key, value in extract_pay_period_dates(page_text).items():
+                        if dates.get(key) is None:
+                            dates[key] = value
 
-            if not full_text.strip():
+                lines.extend(page_text.split('\n'))
+                # Lowercase the whole page at once; lowercasing keeps the line breaks,
+                # so lower_lines[i] always corresponds to lines[i]
+                lower_lines.extend(page_text.lower().split('\n'))
+
+            if not any(line.strip() for line in lines):
                 print(f"Warning: No text extracted from {pdf_path}", file=sys.stderr)
                 return None
 
@@ -638,22 +572,22 @@ def extract_paystub_data(pdf_path: str) -> Optional[Dict[str, str]]:
             data = {"Source File": os.path.basename(pdf_path)}
 
             # Pay period dates
-            data.update(extract_pay_period_dates(full_text))
+            data.update(dates)
 
             # Earnings
-            data.update(parse_earnings_section(full_text))
+            data.update(parse_earnings_section(lines, lower_lines))
 
             # Deductions
-            data.update(parse_deductions_section(full_text))
+            data.update(parse_deductions_section(lines, lower_lines))
 
             # Other section
-            data.update(parse_other_section(full_text))
+            data.update(parse_other_section(lines))
 
             # Taxable wages
-            data.update(extract_taxable_wages(full_text))
+            data.update(extract_taxable_wages(lines, lower_lines))
 
             # Other benefits
-            data.update(parse_other_benefits_section(full_text))
+            data.update(parse_other_benefits_section(lines))
 
             return data
 
@@ -677,19 +611,16 @@ def validate_and_fix_ytd_values(data: List[Dict[str, str]]) -> List[Dict[str, st
     if not data:
         return data
 
-    # Get all YTD field names
-    ytd_fields = set()
-    for record in data:
-        for key in record.keys():
-            if key.endswith(' YTD'):
-                ytd_fields.add(key)
-
-    # For each YTD field, validate and fix values
-    for ytd_field in ytd_fields:
-        last_valid_value = None
+    # Get all YTD field names (in order of first appearance)
+    ytd_fields = list(dict.fromkeys(key for record in data for key in record if key.endswith(' YTD')))
 
-        for i, record in enumerate(data):
+    # Validate and fix all YTD fields in a single pass over the records,
+    # tracking the last valid value of each field
+    last_valid_values: Dict[str, float] = {}
+    for record in data:
+        for ytd_field in ytd_fields:
             current_value_str = record.get(ytd_field, '')
+            last_valid_value = last_valid_values.get(ytd_field)
 
             if current_value_str and current_value_str.strip():
                 try:
@@ -703,7 +634,7 @@ def validate_and_fix_ytd_values(data: List[Dict[str, str]]) -> List[Dict[str, st
                             print(f"Warning: {ytd_field} decreased from {last_valid_value} to {current_value} "
                                   f"in {record.get('Source File', 'unknown file')}", file=sys.stderr)
 
-                    last_valid_value = current_value
+                    last_valid_values[ytd_field] = current_value
                 except ValueError:
                     # Not a valid number, skip
                     pass
@@ -715,12 +646,46 @@ def validate_and_fix_ytd_values(data: List[Dict[str, str]]) -> List[Dict[str, st
     return data
 
 
-def process_pdfs(input_path: str) -> List[Dict[str, str]]:
+def _extract_in_worker_pool(pdf_paths: List[str],
+                            max_workers: int) -> Tuple[Dict[str, Optional[Dict[str, str]]], bool]:
+    """
+    Extract PDFs in a pool of worker processes.
+
+    Returns:
+        Tuple of (results for the PDFs that finished, keyed by path; whether the pool broke
+        because a worker process died)
+    """
+    extracted = {}
+    broken = False
+
+    # No more workers than files, since idle workers are still started
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(pdf_paths))) as executor:
+        futures = []
+        try:
+            for pdf_path in pdf_paths:
+                futures.append((pdf_path, executor.submit(extract_paystub_data, pdf_path)))
+        except BrokenProcessPool:
+            broken = True
+
+        # extract_paystub_data handles its own errors, so the only failure here is a dead worker;
+        # results that finished before the pool broke are still kept
+        for pdf_path, future in futures:
+            try:
+                extracted[pdf_path] = future.result()
+            except BrokenProcessPool:
+                broken = True
+
+    return extracted, broken
+
+
+def process_pdfs(input_path: str, max_workers: Optional[int] = None) -> List[Dict[str, str]]:
     """
     Process one or more PDF files.
+    PDFs in a directory are extracted in parallel worker processes.
 
     Args:
         input_path: Path to a single PDF file or directory containing PDFs
+        max_workers: Maximum number of worker processes (default: number of CPUs)
 
     Returns:
         List of dictionaries containing extracted data
@@ -736,15 +701,47 @@ def process_pdfs(input_path: str) -> List[Dict[str, str]]:
         else:
             print(f"Error: {input_path} is not a PDF file", file=sys.stderr)
     elif path.is_dir():
-        # Process all PDFs in the directory (non-recursive)
-        pdf_files = sorted(path.glob('*.pdf'))
-        if not pdf_files:
+        # Process all PDFs in the directory (non-recursive); scandir's entries carry
+        # the file type, so this needs no extra stat per file on most filesystems
+        with os.scandir(path) as entries:
+            pdf_paths = sorted(
+                entry.path for entry in entries
+                if entry.name.lower().endswith('.pdf') and entry.is_file()
+            )
+        if not pdf_paths:
             print(f"Warning: No PDF files found in {input_path}", file=sys.stderr)
 
-        for pdf_file in pdf_files:
-            data = extract_paystub_data(str(pdf_file))
-            if data:
-                results.append(data)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        if max_workers > 1 and len(pdf_paths) > 1:
+            # Each PDF is independent, so extract them in parallel
+            extracted, broken = _extract_in_worker_pool(pdf_paths, max_workers)
+
+            # If a worker process died (e.g. crashed inside the PDF library), the pool is
+            # unusable and every PDF it hadn't finished has no result. Re-run those one at a
+            # time in a fresh single-worker pool: the first PDF without a result after a
+            # break is the one that crashed, so only that file is skipped.
+            remaining = [pdf_path for pdf_path in pdf_paths if pdf_path not in extracted]
+            while broken and remaining:
+                retried, broken = _extract_in_worker_pool(remaining, 1)
+                extracted.update(retried)
+                remaining = [pdf_path for pdf_path in remaining if pdf_path not in retried]
+                if broken and remaining:
+                    crashed_path = remaining.pop(0)
+                    print(f"Error processing {crashed_path}: worker process terminated abruptly",
+                          file=sys.stderr)
+
+            # Keep results in file order
+            for pdf_path in pdf_paths:
+                data = extracted.get(pdf_path)
+                if data:
+                    results.append(data)
+        else:
+            for pdf_path in pdf_paths:
+                data = extract_paystub_data(pdf_path)
+                if data:
+                    results.append(data)
     else:
         print(f"Error: {input_path} does not exist", file=sys.stderr)
 
@@ -754,16 +751,55 @@ def process_pdfs(input_path: str) -> List[Dict[str, str]]:
     return results
 
 
-def output_json(data: List[Dict[str, str]], output_file: Optional[str] = None):
-    """Output data as JSON."""
-    json_str = json.dumps(data, indent=2)
+def _order_fields(fields: Iterable[str]) -> List[str]:
+    """
+    Order field names for CSV output: FIELD_ORDER (glob patterns allowed), then the
+    YTD versions in the same order, then any other fields alphabetically.
+    """
+    # Single pass: each field goes into the bucket of the first pattern it matches,
+    # with all FIELD_ORDER patterns checked before their YTD versions
+    buckets = [[] for _ in _ORDERED_FIELD_PATTERNS]
+    unordered_fields = []
+    for field in fields:
+        # An exact name match, unless a glob pattern earlier in the order also matches
+        index = _LITERAL_FIELD_INDEX.get(field, len(buckets))
+        for glob_index, glob_regex in _GLOB_FIELD_PATTERNS:
+            if glob_index >= index:
+                break
+            if glob_regex.match(field):
+                index = glob_index
+                break
+
+        if index < len(buckets):
+            buckets[index].append(field)
+        else:
+            unordered_fields.append(field)
+
+    # Fields from FIELD_ORDER first, then the YTD versions of the same fields in the same order
+    # (glob matches are sorted within their pattern)
+    ordered_fields = [field for bucket in buckets for field in sorted(bucket)]
+
+    # Finally, add any remaining fields that weren't in the predefined order (alphabetically)
+    ordered_fields.extend(sorted(unordered_fields))
+
+    return ordered_fields
+
+
+def output_json(data: List[Dict[str, str]], output_file: Optional[str] = None, compact: bool = False):
+    """Output data as JSON (indented, or on a single line if compact)."""
+    # Serialize straight into the output stream rather than building the whole string first
+    if compact:
+        dump_options = {'separators': (',', ':')}
+    else:
+        dump_options = {'indent': 2}
 
     if output_file:
-        with open(output_file, 'w') as f:
-            f.write(json_str)
+        with open(output_file, 'w', buffering=_OUTPUT_BUFFER_SIZE) as f:
+            json.dump(data, f, check_circular=False, **dump_options)
         print(f"Data written to {output_file}", file=sys.stderr)
     else:
-        print(json_str)
+        json.dump(data, sys.stdout, check_circular=False, **dump_options)
+        sys.stdout.write('\n')
 
 
 def output_csv(data: List[Dict[str, str]], output_file: Optional[str] = None):
@@ -777,86 +813,43 @@ def output_csv(data: List[Dict[str, str]], output_file: Optional[str] = None):
         return
 
     # Collect all unique field names across all records
-    all_fields = set()
+    # (a dict keeps the fields in the order they were first seen)
+    all_fields = {}
     for record in data:
-        all_fields.update(record.keys())
+        all_fields.update(dict.fromkeys(record))
 
     # Remove "Source File" from the field list
-    all_fields.discard("Source File")
+    all_fields.pop("Source File", None)
 
     # Sort fields according to the specified order (with glob pattern support)
-    # First, add fields from FIELD_ORDER that exist in the data
-    ordered_fields = []
-    for field_pattern in FIELD_ORDER:
-        # Check if it's a glob pattern
-        if '*' in field_pattern or '?' in field_pattern or '[' in field_pattern:
-            # Find all matching fields
-            matching_fields = [f for f in all_fields if fnmatch.fnmatch(f, field_pattern)]
-            for matched_field in sorted(matching_fields):
-                if matched_field in all_fields:
-                    ordered_fields.append(matched_field)
-                    all_fields.discard(matched_field)
-        else:
-            # Exact match
-            if field_pattern in all_fields:
-                ordered_fields.append(field_pattern)
-                all_fields.discard(field_pattern)
-
-    # Then add YTD versions of the same fields in the same order
-    ytd_fields = []
-    for field_pattern in FIELD_ORDER:
-        ytd_pattern = f"{field_pattern} YTD"
-        # Check if it's a glob pattern
-        if '*' in ytd_pattern or '?' in ytd_pattern or '[' in ytd_pattern:
-            # Find all matching fields
-            matching_fields = [f for f in all_fields if fnmatch.fnmatch(f, ytd_pattern)]
-            for matched_field in sorted(matching_fields):
-                if matched_field in all_fields:
-                    ytd_fields.append(matched_field)
-                    all_fields.discard(matched_field)
-        else:
-            # Exact match
-            if ytd_pattern in all_fields:
-                ytd_fields.append(ytd_pattern)
-                all_fields.discard(ytd_pattern)
-
-    ordered_fields.extend(ytd_fields)
-
-    # Finally, add any remaining fields that weren't in the predefined order (alphabetically)
-    ordered_fields.extend(sorted(all_fields))
+    ordered_fields = _order_fields(all_fields)
 
-    # Build the transposed CSV
-    rows = []
+    # Build the transposed CSV (each record's get() is looked up once rather than per field)
+    getters = [record.get for record in data]
 
     # First row: pay dates for each paystub
-    pay_date_row = ["Pay Date"]
-    for record in data:
-        pay_date = record.get("Pay Date", "Unknown")
-        pay_date_row.append(pay_date)
-    rows.append(pay_date_row)
-
-    # Data rows: each field becomes a row (skip Pay Date since it's the header)
-    for field in ordered_fields:
-        if field == "Pay Date":
-            continue  # Skip Pay Date as it's already the header row
-        row = [field]
-        for record in data:
-            value = record.get(field, "")
-            row.append(value)
-        rows.append(row)
-
-    # Write CSV
+    pay_date_row = ["Pay Date", *[get("Pay Date", "Unknown") for get in getters]]
+
+    # Data rows: each field becomes a row (skip Pay Date since it's the header).
+    # The rows are generated as they are written rather than collected into a list first.
+    data_rows = (
+        [field, *[get(field, "") for get in getters]]
+        for field in ordered_fields
+        if field != "Pay Date"
+    )
+
+    # Write CSV (the same explicit format for files and stdout: minimal quoting, plain newlines)
     if output_file:
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
+        with open(output_file, 'w', newline='', buffering=_OUTPUT_BUFFER_SIZE) as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+            writer.writerow(pay_date_row)
+            writer.writerows(data_rows)
         print(f"Data written to {output_file}", file=sys.stderr)
     else:
-        import io
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerows(rows)
-        print(output.getvalue().rstrip())
+        # Write straight to stdout rather than collecting it all first
+        writer = csv.writer(sys.stdout, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+        writer.writerow(pay_date_row)
+        writer.writerows(data_rows)
 
 
 def main():
@@ -869,6 +862,8 @@ Examples:
   %(prog)s paystub.pdf
   %(prog)s paystubs/ --output-format csv
   %(prog)s paystub.pdf --output-format json --output-file output.json
+  %(prog)s paystubs/ --max-workers 4
+  %(prog)s paystubs/ --compact | jq .
         """
     )
 
@@ -889,10 +884,26 @@ Examples:
         help='Output file path (default: stdout)'
     )
 
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write JSON on a single line without indentation'
+    )
+
+    parser.add_argument(
+        '--max-workers', '--workers',
+        dest='max_workers',
+        type=int,
+        help='Maximum number of worker processes for a directory of PDFs (default: number of CPUs)'
+    )
+
     args = parser.parse_args()
 
+    if args.max_workers is not None and args.max_workers < 1:
+        parser.error('--max-workers must be at least 1')
+
     # Process PDFs
-    data = process_pdfs(args.input)
+    data = process_pdfs(args.input, args.max_workers)
 
     if not data:
         print("No data extracted", file=sys.stderr)
@@ -900,7 +911,7 @@ Examples:
 
     # Output results
     if args.output_format == 'json':
-        output_json(data, args.output_file)
+        output_json(data, args.output_file, args.compact)
     else:
         output_csv(data, args.output_file)
 